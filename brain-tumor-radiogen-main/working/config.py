@@ -1,10 +1,12 @@
 NUM_IMAGES_3D = 64
 TRAINING_BATCH_SIZE = 8
 TEST_BATCH_SIZE = 8
-IMAGE_SIZE = 256
+IMAGE_SIZE = 256  # Existing weights were trained at 256; retrain + check validation AUC before lowering
 N_EPOCHS = 15
 do_valid = True
 n_workers = 0  # Fixed for Windows
+n_test_workers = 4  # predict.py guards its entry point, so this is Windows-safe
+CACHE_VOLUMES = True  # Keep decoded case volumes as float16 .npy under ../input/volume_cache
 
 # Hyperparameters for training new models
 LR = 1e-4
@@ -14,4 +16,5 @@ OPTIM_THRESHOLD = True
 # Inference Settings for Existing Weights
 MODEL_NAME = "resnet10" 
 Z_SCORE_NORM = False # 0-1 scaling matches original weights
-TTA_STEPS = 4        # Test Time Augmentation iterations
\ No newline at end of file
+TTA_STEPS = 4        # Test Time Augmentation iterations
+JIT_TRACE = True     # Trace + freeze the model for fixed-shape inference
\ No newline at end of file
@@ -91,6 +91,13 @@ class BrainRSNADataset(Dataset):
     ):
         case_id = str(case_id).zfill(5)
 
+        cache_path = (
+            f"../input/volume_cache/{self.folder}_{self.type}_{case_id}"
+            f"_{num_imgs}_{img_size}_{rotate}_{int(config.Z_SCORE_NORM)}.npy"
+        )
+        if config.CACHE_VOLUMES and os.path.exists(cache_path):
+            return np.load(cache_path, mmap_mode="r")
+
         path = f"../input/{self.folder}/{case_id}/{self.type}/*.dcm"
         files = sorted(
             glob.glob(path),
@@ -114,4 +121,13 @@ class BrainRSNADataset(Dataset):
             n_zero = np.zeros((img_size, img_size, num_imgs - img3d.shape[-1]))
             img3d = np.concatenate((img3d, n_zero), axis=-1)
 
-        return np.expand_dims(img3d, 0)
+        img3d = np.expand_dims(img3d, 0)
+        if config.CACHE_VOLUMES:
+            # Same dtype on first and cached reads; atomic write avoids partial files
+            img3d = img3d.astype(np.float16)
+            os.makedirs("../input/volume_cache", exist_ok=True)
+            with open(f"{cache_path}.tmp", "wb") as f:
+                np.save(f, img3d)
+            os.replace(f"{cache_path}.tmp", cache_path)
+
+        return img3d
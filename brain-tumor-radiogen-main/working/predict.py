@@ -1,87 +1,104 @@
 import argparse
+import copy
 import os
 
 import monai
 import numpy as np
 import pandas as pd
 import torch
-import torch.nn as nn
 
 from tqdm import tqdm
 
 from dataset import BrainRSNADataset
 import config
-import monai.transforms as T
-
-parser = argparse.ArgumentParser()
-parser.add_argument("--type", default="FLAIR", type=str)
-parser.add_argument("--model_name", default="b0", type=str)
-args = parser.parse_args()
-
-data = pd.read_csv("../input/sample_submission.csv")
-
-
-# model
-if config.MODEL_NAME == "resnet18":
-    model = monai.networks.nets.resnet18(spatial_dims=3, n_input_channels=1, num_classes=1)
-elif config.MODEL_NAME == "resnet10":
-    model = monai.networks.nets.resnet10(spatial_dims=3, n_input_channels=1, num_classes=1)
-else:
-    model = monai.networks.nets.resnet10(spatial_dims=3, n_input_channels=1, num_classes=1)
-device = torch.device("cpu")
-model.to(device)
-all_weights = os.listdir("../weights/")
-fold_files = sorted([f for f in all_weights if (args.type in f) and (config.MODEL_NAME in f)])
-criterion = nn.BCEWithLogitsLoss()
-
-
-test_dataset = BrainRSNADataset(data=data, mri_type=args.type, is_train=False)
-test_dl = torch.utils.data.DataLoader(
-    test_dataset, batch_size=1, shuffle=False, num_workers=0
-)
-
-preds_f = np.zeros(len(data))
-for fold in range(5):
-    image_ids = []
-    model.load_state_dict(torch.load(f"../weights/{fold_files[fold]}", map_location=device))
-    preds = []
-    epoch_iterator_test = tqdm(test_dl)
-    # TTA Transforms
-    tta_transforms = [
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--type", default="FLAIR", type=str)
+    parser.add_argument("--model_name", default="b0", type=str)
+    args = parser.parse_args()
+
+    data = pd.read_csv("../input/sample_submission.csv")
+
+
+    # model
+    if config.MODEL_NAME == "resnet18":
+        model = monai.networks.nets.resnet18(spatial_dims=3, n_input_channels=1, num_classes=1)
+    elif config.MODEL_NAME == "resnet10":
+        model = monai.networks.nets.resnet10(spatial_dims=3, n_input_channels=1, num_classes=1)
+    else:
+        model = monai.networks.nets.resnet10(spatial_dims=3, n_input_channels=1, num_classes=1)
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    torch.backends.cudnn.benchmark = True  # input shape is fixed by config
+    model.to(device, memory_format=torch.channels_last_3d)
+    all_weights = os.listdir("../weights/")
+    fold_files = sorted([f for f in all_weights if (args.type in f) and (config.MODEL_NAME in f)])
+
+
+    test_dataset = BrainRSNADataset(data=data, mri_type=args.type, is_train=False)
+    test_dl = torch.utils.data.DataLoader(
+        test_dataset,
+        batch_size=1,
+        shuffle=False,
+        num_workers=config.n_test_workers,
+        pin_memory=device.type == "cuda",
+        persistent_workers=config.n_test_workers > 0,
+        prefetch_factor=4 if config.n_test_workers > 0 else 2,
+    )
+
+    # TTA flips over the spatial dims of a (B, C, H, W, D) batch
+    tta_flip_dims = [
         None, # Original
-        T.RandFlip(prob=1.0, spatial_axis=0),
-        T.RandFlip(prob=1.0, spatial_axis=1),
-        T.RandFlip(prob=1.0, spatial_axis=2),
+        2,
+        3,
+        4,
     ]
+    n_tta = min(config.TTA_STEPS, len(tta_flip_dims))
 
+    # Load every fold once so each test volume is read and preprocessed a single time
+    fold_models = []
+    with torch.no_grad():
+        for fold in range(5):
+            fold_model = copy.deepcopy(model)
+            fold_model.load_state_dict(torch.load(f"../weights/{fold_files[fold]}", map_location=device))
+            fold_model.eval()
+            if config.JIT_TRACE:
+                # Fixed input shape: trace + freeze once per fold to fold BN into conv
+                example = torch.zeros(
+                    n_tta, 1, config.IMAGE_SIZE, config.IMAGE_SIZE, config.NUM_IMAGES_3D, device=device
+                ).contiguous(memory_format=torch.channels_last_3d)
+                fold_model = torch.jit.freeze(torch.jit.trace(fold_model, example))
+            fold_models.append(fold_model)
+
+    # Running mean over TTA views and folds, accumulated in place per sample
+    preds_f = torch.zeros(len(data), device=device)
+    ids_f = np.zeros(len(data), dtype=np.int64)
+    n_preds = n_tta * len(fold_models)
+    offset = 0
+    epoch_iterator_test = tqdm(test_dl)
     with torch.no_grad():
         for step, batch in enumerate(epoch_iterator_test):
-            model.eval()
-            images = batch["image"].to(device)
-            
-            # TTA logic
-            batch_preds = []
-            for tta_idx in range(min(config.TTA_STEPS, len(tta_transforms))):
-                aug = tta_transforms[tta_idx]
-                if aug is not None:
-                    aug_images = aug(images)
-                else:
-                    aug_images = images
-                
-                outputs = model(aug_images)
-                batch_preds.append(outputs.sigmoid().detach().cpu().numpy())
-            
-            # Average across TTA steps for this batch
-            avg_batch_pred = np.mean(batch_preds, axis=0)
-            preds.append(avg_batch_pred)
-            image_ids.append(batch["case_id"].detach().cpu().numpy())
-
-    preds_f += np.vstack(preds).T[0] / 5
-
-    ids_f = np.hstack(image_ids)
-
-data["BraTS21ID"] = ids_f
-data["MGMT_value"] = preds_f
-
-data = data.sort_values(by="BraTS21ID").reset_index(drop=True)
-data.to_csv("c:/KJU/prediction_output.csv", index=False)
+            images = batch["image"].to(device, memory_format=torch.channels_last_3d, non_blocking=True)
+            batch_size = images.shape[0]
+
+            # TTA logic: run all augmented views in a single forward pass
+            aug_batch = torch.cat(
+                [images if dim is None else images.flip(dim) for dim in tta_flip_dims[:n_tta]], dim=0
+            )
+            for fold_model in fold_models:
+                with torch.cuda.amp.autocast(enabled=device.type == "cuda"):
+                    outputs = fold_model(aug_batch).float().sigmoid()
+                preds_f[offset : offset + batch_size] += outputs.view(n_tta, batch_size).sum(dim=0) / n_preds
+            ids_f[offset : offset + batch_size] = batch["case_id"].numpy()
+            offset += batch_size
+
+    data["BraTS21ID"] = ids_f
+    data["MGMT_value"] = preds_f.cpu().numpy()
+
+    data = data.sort_values(by="BraTS21ID").reset_index(drop=True)
+    data.to_csv("c:/KJU/prediction_output.csv", index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,19 +22,19 @@ def load_dicom_image(path, img_size=config.IMAGE_SIZE, voi_lut=True, rotate=0):
         ]
         data = cv2.rotate(data, rot_choices[rotate])
 
-    data = cv2.resize(data, (img_size, img_size))
-    data = data - np.min(data)
-    if np.min(data) < np.max(data):
-        data = data / np.max(data)
-    
+    data = cv2.resize(data, (img_size, img_size)).astype(np.float32)
+    lo, hi = data.min(), data.max()
+    data -= lo
+    if lo < hi:
+        data /= hi - lo
+
     if config.Z_SCORE_NORM:
-        mean = np.mean(data)
-        std = np.std(data)
+        mean = data.mean()
+        std = data.std()
+        data -= mean
         if std > 0:
-            data = (data - mean) / std
-        else:
-            data = data - mean
-            
+            data /= std
+
     return data
 
 
@@ -22,7 +22,8 @@ def verify():
     print(f"Image shape: {img.shape}")
     print(f"Image mean: {img.mean():.4f}, std: {img.std():.4f}")
     
-    if img.shape == (1, 256, 256, 64):
+    expected_shape = (1, config.IMAGE_SIZE, config.IMAGE_SIZE, config.NUM_IMAGES_3D)
+    if img.shape == expected_shape:
         print("Data shape is correct.")
     else:
         print(f"Warning: Unexpected shape {img.shape}")